@@ -0,0 +1,85 @@
+import logging
+from datetime import date, datetime
+from typing import Iterator
+from sqlalchemy import text
+
+log = logging.getLogger(__name__)
+
+# Postgres-only: tables range-partitioned by month on the given timestamp column.
+PARTITIONED = {"messages": "time", "feedback": "created_at"}
+
+def month_start(d) -> date:
+    return date(d.year, d.month, 1)
+
+def next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+def month_starts(first, last) -> Iterator[date]:
+    """First day of every month from `first` through `last`, inclusive."""
+    m, end = month_start(first), month_start(last)
+    while m <= end:
+        yield m
+        m = next_month(m)
+
+def partition_name(table: str, m: date) -> str:
+    return f"{table}_y{m.year:04d}m{m.month:02d}"
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+def create_partition_sql(table: str, m: date, parent: str | None = None) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(table, m)} PARTITION OF {parent or table} "
+            f"FOR VALUES FROM ('{m.isoformat()}') TO ('{next_month(m).isoformat()}')")
+
+def is_partitioned(conn, table: str) -> bool:
+    if conn.dialect.name != "postgresql": return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :t"
+    ), {"t": table}).first() is not None
+
+def _exists(conn, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:n) IS NOT NULL"), {"n": name}).scalar()
+
+def _create_partition(conn, table: str, col: str, m: date):
+    """Create the partition for month `m`, moving any rows already in DEFAULT into it.
+
+    Postgres refuses to add a partition whose range overlaps rows held by the
+    DEFAULT partition, so DEFAULT is detached, drained for that range and
+    re-attached around the CREATE.
+    """
+    default = default_partition_name(table)
+    lo, hi = m.isoformat(), next_month(m).isoformat()
+    in_range = f"{col} >= '{lo}' AND {col} < '{hi}'"
+    if not (_exists(conn, default) and conn.execute(text(f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1")).first()):
+        conn.execute(text(create_partition_sql(table, m)))
+        return
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    conn.execute(text(create_partition_sql(table, m)))
+    conn.execute(text(f"INSERT INTO {table} SELECT * FROM {default} WHERE {in_range}"))
+    conn.execute(text(f"DELETE FROM {default} WHERE {in_range}"))
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+def ensure_partitions(conn, months_ahead: int = 3, today: datetime | None = None,
+                      since: datetime | None = None) -> list:
+    """Create any missing monthly partitions from `since` (default: this month)
+    through `months_ahead` months after `today`. No-op off Postgres.
+
+    Each partition is created in its own savepoint; a failure is logged and
+    skipped so the remaining months (and callers) are unaffected.
+    """
+    today = today or datetime.utcnow()
+    last = today
+    for _ in range(months_ahead): last = next_month(month_start(last))
+    names = []
+    for table, col in PARTITIONED.items():
+        if not is_partitioned(conn, table): continue
+        for m in month_starts(since or today, last):
+            name = partition_name(table, m)
+            if _exists(conn, name): continue
+            try:
+                with conn.begin_nested():
+                    _create_partition(conn, table, col, m)
+                names.append(name)
+            except Exception:
+                log.exception("could not create partition %s", name)
+    return names
@@ -0,0 +1,186 @@
+"""Opt-in request profiling.
+
+A sampled request (`PROFILE_SAMPLE_RATE`) gets a `Trace`: per-stage timings
+recorded by `span()`/`mark()` and collapsed stacks from a background sampler
+thread. Only threads currently inside one of the trace's spans are sampled;
+async spans still see whatever else the event loop runs while they await.
+Traces slower than `PROFILE_SLOW_MS` are kept in memory for `/admin/profiles`
+and, if `PROFILE_DUMP_DIR` is set, written there as `<id>.json` plus
+`<id>.folded` (flamegraph.pl / speedscope input). Dumps are built and written
+by the sampler thread, never on the event loop.
+
+With sampling off, `trace()` costs one comparison and `span()` one ContextVar
+lookup. Stages may nest (e.g. `llm.ttft` inside `llm.stream`), so they need not
+sum to the total.
+"""
+import json, logging, os, random, sys, threading, time, uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+from app.core.settings import settings
+
+log = logging.getLogger(__name__)
+_current: ContextVar[Optional["Trace"]] = ContextVar("profiling_trace", default=None)
+_dumps = deque(maxlen=settings.PROFILE_MAX_DUMPS)
+MAX_DEPTH = 64
+
+class Trace:
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = datetime.utcnow()
+        self.t0 = time.perf_counter()
+        self.total_ms = None
+        self.stages = {}
+        self.active = Counter()  # thread ident -> open spans on that thread
+        self.lock = threading.Lock()
+        self.sampler = _Sampler(self, settings.PROFILE_INTERVAL_MS / 1000)
+
+    def add(self, stage: str, seconds: float):
+        with self.lock: self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def enter_thread(self, tid: int):
+        with self.lock: self.active[tid] += 1
+
+    def exit_thread(self, tid: int):
+        with self.lock:
+            self.active[tid] -= 1
+            if self.active[tid] <= 0: del self.active[tid]
+
+class _Sampler(threading.Thread):
+    """Samples the threads inside the trace's spans; builds the dump when stopped."""
+
+    def __init__(self, trace: Trace, interval: float):
+        super().__init__(daemon=True, name=f"profiler-{trace.id}")
+        self.trace = trace
+        self.interval = interval
+        self.counts = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            with self.trace.lock: tids = tuple(self.trace.active)
+            if not tids: continue
+            frames = sys._current_frames()
+            for tid in tids:
+                f = frames.get(tid)
+                if f is not None:
+                    self.counts[_collapse(f)] += 1
+        _dump(self.trace, self.counts)
+
+    def stop(self):
+        self._done.set()
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        co = frame.f_code
+        names.append(f"{os.path.basename(co.co_filename)}:{co.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class _Span:
+    def __init__(self, trace: Trace, name: str):
+        self.trace, self.name = trace, name
+
+    __slots__ = ("trace", "name", "t0", "tid")
+
+    def __enter__(self):
+        self.tid = threading.get_ident()
+        self.trace.enter_thread(self.tid)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, time.perf_counter() - self.t0)
+        self.trace.exit_thread(self.tid)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+    def __enter__(self): return None
+    def __exit__(self, *exc): return False
+
+_NOOP = _NoSpan()
+
+def span(name: str):
+    """Time a stage of the current trace; a shared no-op when not sampling."""
+    tr = _current.get()
+    return _NOOP if tr is None else _Span(tr, name)
+
+def mark(name: str, seconds: float):
+    """Record a duration measured by the caller (e.g. time to first token)."""
+    tr = _current.get()
+    if tr is not None: tr.add(name, seconds)
+
+def begin(name: str) -> Optional[Trace]:
+    rate = settings.PROFILE_SAMPLE_RATE
+    if rate <= 0 or random.random() >= rate: return None
+    tr = Trace(name)
+    tr.sampler.start()
+    return tr
+
+def finish(tr: Trace):
+    """Stop the trace clock; the sampler thread exits and records any slow dump."""
+    tr.total_ms = (time.perf_counter() - tr.t0) * 1000
+    tr.sampler.stop()
+
+def _dump(tr: Trace, counts: Counter) -> Optional[dict]:
+    if tr.total_ms is None or tr.total_ms < settings.PROFILE_SLOW_MS: return None
+    with tr.lock: stages = dict(tr.stages)
+    dump = {
+        "id": tr.id, "name": tr.name, "started_at": tr.started_at.isoformat(),
+        "total_ms": round(tr.total_ms, 3),
+        "stages_ms": {k: round(v * 1000, 3) for k, v in sorted(stages.items(), key=lambda kv: -kv[1])},
+        "samples": sum(counts.values()),
+        "collapsed": [f"{stack} {n}" for stack, n in counts.most_common()],
+    }
+    _dumps.append(dump)
+    if settings.PROFILE_DUMP_DIR:
+        try: _write(dump)
+        except OSError: log.exception("could not write profile %s", dump["id"])
+    return dump
+
+def _write(dump: dict):
+    os.makedirs(settings.PROFILE_DUMP_DIR, exist_ok=True)
+    base = os.path.join(settings.PROFILE_DUMP_DIR, f"{dump['started_at'][:19].replace(':', '')}-{dump['id']}")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(dump, f, indent=2)
+    with open(base + ".folded", "w", encoding="utf-8") as f:
+        f.write("\n".join(dump["collapsed"]) + "\n")
+
+class _Active:
+    __slots__ = ("trace", "token")
+
+    def __init__(self, trace: Trace):
+        self.trace = trace
+
+    def __enter__(self):
+        self.token = _current.set(self.trace)
+        return self.trace
+
+    def __exit__(self, *exc):
+        _current.reset(self.token)
+        finish(self.trace)
+        return False
+
+def trace(name: str):
+    """Profile the enclosed block if this call is sampled; `as` binds the Trace or None."""
+    tr = begin(name)
+    return _NOOP if tr is None else _Active(tr)
+
+def recent_dumps() -> list:
+    return list(_dumps)
+
+class ProfilingMiddleware:
+    """ASGI middleware sampling HTTP requests. Websocket turns are traced in the handler."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.PROFILE_SAMPLE_RATE <= 0:
+            return await self.app(scope, receive, send)
+        with trace(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
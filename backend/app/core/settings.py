@@ -13,6 +13,20 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str = Field(..., env="SUPABASE_ANON_KEY")
     SUPABASE_SERVICE_ROLE_KEY: str = Field(..., env="SUPABASE_SERVICE_ROLE_KEY")
     SUPABASE_JWKS_CACHE_SECONDS: int = Field(86400, env="SUPABASE_JWKS_CACHE_SECONDS")
+    ADMIN_USER_IDS: str = Field("", env="ADMIN_USER_IDS")  # comma-separated auth.uid()s
+
+    # Retention: ended sessions older than RETENTION_DAYS are archived to storage
+    RETENTION_DAYS: int = Field(180, env="RETENTION_DAYS")
+    RETENTION_BATCH: int = Field(200, env="RETENTION_BATCH")
+    RETENTION_INTERVAL_SECONDS: int = Field(0, env="RETENTION_INTERVAL_SECONDS")  # 0 = job disabled
+    PARTITION_INTERVAL_SECONDS: int = Field(86400, env="PARTITION_INTERVAL_SECONDS")  # monthly partition upkeep
+
+    # Profiling (opt-in): fraction of HTTP requests / websocket turns to sample
+    PROFILE_SAMPLE_RATE: float = Field(0.0, env="PROFILE_SAMPLE_RATE")
+    PROFILE_SLOW_MS: int = Field(1000, env="PROFILE_SLOW_MS")      # keep traces at least this slow
+    PROFILE_INTERVAL_MS: int = Field(5, env="PROFILE_INTERVAL_MS")  # stack sampling interval
+    PROFILE_DUMP_DIR: str = Field("", env="PROFILE_DUMP_DIR")      # empty = memory only
+    PROFILE_MAX_DUMPS: int = Field(100, env="PROFILE_MAX_DUMPS")
 
     # LLM: Gemini
     GEMINI_API_KEY: str = Field(..., env="GEMINI_API_KEY")
@@ -22,6 +36,10 @@ class Settings(BaseSettings):
     def origins_list(self) -> List[str]:
         return [o.strip() for o in self.API_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def admin_ids(self) -> List[str]:
+        return [u.strip() for u in self.ADMIN_USER_IDS.split(",") if u.strip()]
+
     class Config:
         env_file = ".env"
 
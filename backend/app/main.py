@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.middleware import SlowAPIMiddleware
-import logging, sys
+import asyncio, logging, sys
 
 from app.core.settings import settings
-from app.routers import health, debate_config, realtime, feedback, history
+from app.core.profiling import ProfilingMiddleware
+from app.services import retention
+from app.routers import health, debate_config, realtime, feedback, history, export, admin
 
 logging.basicConfig(
     stream=sys.stdout,
@@ -23,12 +25,31 @@ app.add_middleware(
 )
 
 app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 app.include_router(health.router, tags=["health"])
 app.include_router(debate_config.router, tags=["session"])
 app.include_router(realtime.router, prefix="/realtime", tags=["realtime"])
 app.include_router(feedback.router, tags=["feedback"])
 app.include_router(history.router, tags=["history"])
+app.include_router(export.router, tags=["export"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def start_background_jobs():
+    # asyncio holds tasks weakly; keep references so the jobs are not collected.
+    app.state.jobs = []
+    if settings.PARTITION_INTERVAL_SECONDS > 0:
+        app.state.jobs.append(asyncio.create_task(
+            retention.run_forever(retention.maintain_partitions, settings.PARTITION_INTERVAL_SECONDS)))
+    if settings.RETENTION_INTERVAL_SECONDS > 0:
+        app.state.jobs.append(asyncio.create_task(
+            retention.run_forever(retention.run_once, settings.RETENTION_INTERVAL_SECONDS)))
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for task in getattr(app.state, "jobs", []):
+        task.cancel()
 
 @app.get("/")
 def root():
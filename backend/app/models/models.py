@@ -15,10 +15,13 @@ class Session(Base):
     turn = Column(String, default="user")        # user|ai
     started_at = Column(DateTime, default=datetime.utcnow)
     ended_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=True)   # set once messages moved to storage
+    archive_path = Column(String, nullable=True)     # object path in the transcripts bucket
 
     messages = relationship("Message", back_populates="session", cascade="all, delete-orphan")
 
 Index("idx_sessions_user_started", Session.user_id, Session.started_at)
+Index("idx_sessions_state_ended", Session.state, Session.ended_at)
 
 class Message(Base):
     __tablename__ = "messages"
@@ -29,6 +32,9 @@ class Message(Base):
     time = Column(DateTime, default=datetime.utcnow)
     session = relationship("Session", back_populates="messages")
 
+# Postgres: messages/feedback are range-partitioned by month (see migrations 0002).
+Index("idx_messages_session_time", Message.session_id, Message.time)
+
 class Feedback(Base):
     __tablename__ = "feedback"
     id = Column(Integer, primary_key=True)
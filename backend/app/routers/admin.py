@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.core import profiling
+from app.routers.deps_supabase import get_current_user, is_admin
+
+router = APIRouter()
+
+def require_admin(user = Depends(get_current_user)):
+    if not is_admin(user): raise HTTPException(403, "Forbidden")
+    return user
+
+@router.get("/profiles")
+def list_profiles(user = Depends(require_admin)):
+    return [{k: d[k] for k in ("id", "name", "started_at", "total_ms", "stages_ms", "samples")}
+            for d in reversed(profiling.recent_dumps())]
+
+def _find(profile_id: str) -> dict:
+    for d in profiling.recent_dumps():
+        if d["id"] == profile_id: return d
+    raise HTTPException(404, "Not found")
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, user = Depends(require_admin)):
+    return _find(profile_id)
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def get_collapsed(profile_id: str, user = Depends(require_admin)):
+    return "\n".join(_find(profile_id)["collapsed"]) + "\n"
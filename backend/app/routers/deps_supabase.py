@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.settings import settings
+from app.core import profiling
 import requests, json
 import jwt
 from jwt import algorithms
@@ -22,7 +23,8 @@ def _get_jwks():
 def _public_key_for(token):
     headers = jwt.get_unverified_header(token)
     kid = headers.get("kid")
-    jwks = _get_jwks()
+    with profiling.span("auth.jwks"):
+        jwks = _get_jwks()
     for key in jwks["keys"]:
         if key.get("kid") == kid:
             return algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
@@ -34,7 +36,11 @@ def get_current_user(creds: HTTPAuthorizationCredentials = Depends(bearer)):
     token = creds.credentials
     try:
         pub = _public_key_for(token)
-        claims = jwt.decode(token, pub, algorithms=["RS256"], audience=None, options={"verify_aud": False})
+        with profiling.span("auth.verify"):
+            claims = jwt.decode(token, pub, algorithms=["RS256"], audience=None, options={"verify_aud": False})
         return {"sub": claims.get("sub"), "email": claims.get("email")}
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+def is_admin(user) -> bool:
+    return bool(user.get("sub")) and user["sub"] in settings.admin_ids
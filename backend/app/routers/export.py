@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from app.services.export_service import export_stream
+from app.routers.deps_supabase import get_current_user, is_admin
+
+router = APIRouter()
+
+@router.get("/export")
+def export_sessions(since: datetime | None = None, until: datetime | None = None, cursor: str | None = None,
+                    gzip: bool = False, all_users: bool = False, user = Depends(get_current_user)):
+    if all_users and not is_admin(user): raise HTTPException(403, "Forbidden")
+    try:
+        body = export_stream(None if all_users else user["sub"], since, until, cursor, gzip)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if gzip:
+        return StreamingResponse(body, media_type="application/gzip",
+                                 headers={"Content-Disposition": 'attachment; filename="commcoach-export.ndjson.gz"'})
+    return StreamingResponse(body, media_type="application/x-ndjson")
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import desc
 from app.core.db import SessionLocal
-from app.models.models import Session as S, Message, Feedback
+from app.models.models import Session as S, Feedback
+from app.services.retention import session_messages, WINDOW_SLACK
 from app.routers.deps_supabase import get_current_user
 
 router = APIRouter()
@@ -23,11 +24,13 @@ def get_session(session_id: str, user = Depends(get_current_user)):
         if not s: raise HTTPException(404, "Not found")
         if s.user_id != user["sub"]: raise HTTPException(403, "Forbidden")
 
-        msgs = db.query(Message).filter(Message.session_id==s.id).order_by(Message.time).all()
-        fb = db.query(Feedback).filter(Feedback.session_id==s.id).first()
+        msgs = session_messages(db, s)
+        fb_q = db.query(Feedback).filter(Feedback.session_id==s.id)
+        if s.started_at: fb_q = fb_q.filter(Feedback.created_at >= s.started_at - WINDOW_SLACK)  # partition pruning
+        fb = fb_q.first()
         return {
             "id": s.id, "mode": s.mode, "topic": s.topic, "config": s.config,
-            "messages": [{"role": m.role, "content": m.content, "time": m.time.isoformat()} for m in msgs],
+            "messages": msgs,
             "feedback": ({
                 "clarity": fb.clarity, "structure": fb.structure, "persuasiveness": fb.persuasiveness,
                 "fluency": fb.fluency, "time": fb.time_score, "overall": fb.overall, "tips": fb.tips
@@ -0,0 +1,128 @@
+import argparse, base64, json, sys, zlib
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import tuple_
+from app.core.db import SessionLocal
+from app.models.models import Session as S, Message, Feedback
+
+BATCH_SIZE = 500
+CHUNK_BYTES = 64 * 1024  # StreamingResponse hops to the threadpool once per chunk
+
+def encode_cursor(started_at: datetime, session_id: str) -> str:
+    raw = f"{started_at.isoformat()}|{session_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str):
+    try:
+        ts, sid = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(ts), sid
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _session_row(s: S) -> dict:
+    return {"type": "session", "id": s.id, "user_id": s.user_id, "mode": s.mode, "topic": s.topic,
+            "config": s.config, "state": s.state, "round_no": s.round_no,
+            "started_at": s.started_at.isoformat() if s.started_at else None,
+            "ended_at": s.ended_at.isoformat() if s.ended_at else None,
+            "archived_at": s.archived_at.isoformat() if s.archived_at else None,
+            "archive_path": s.archive_path}
+
+def _message_row(m: Message) -> dict:
+    return {"type": "message", "session_id": m.session_id, "role": m.role, "content": m.content,
+            "time": m.time.isoformat() if m.time else None}
+
+def _feedback_row(fb: Feedback) -> dict:
+    return {"type": "feedback", "session_id": fb.session_id, "clarity": fb.clarity, "structure": fb.structure,
+            "persuasiveness": fb.persuasiveness, "fluency": fb.fluency, "time": fb.time_score,
+            "overall": fb.overall, "tips": fb.tips,
+            "created_at": fb.created_at.isoformat() if fb.created_at else None}
+
+def _flush(db, batch: list) -> Iterator[dict]:
+    ids = [s.id for s in batch]
+    for s in batch:
+        yield _session_row(s)
+    # batch is ordered by started_at, so these lower bounds let Postgres prune older partitions
+    since = batch[0].started_at - timedelta(days=1)
+    for m in (db.query(Message).filter(Message.session_id.in_(ids), Message.time >= since)
+                .order_by(Message.session_id, Message.time, Message.id).yield_per(BATCH_SIZE)):
+        yield _message_row(m)
+    for fb in (db.query(Feedback).filter(Feedback.session_id.in_(ids), Feedback.created_at >= since)
+                 .order_by(Feedback.session_id, Feedback.id).yield_per(BATCH_SIZE)):
+        yield _feedback_row(fb)
+    last = batch[-1]
+    yield {"type": "cursor", "cursor": encode_cursor(last.started_at, last.id)}
+
+def iter_records(db, user_id: Optional[str] = None, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None, cursor: Optional[str] = None,
+                 batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    """Yield export records in (started_at, id) order.
+
+    Sessions are read in batches of `batch_size`; each batch is followed by its
+    messages, its feedback and a `cursor` record that resumes after the batch.
+    Archived sessions carry no message records; their transcript blob is named
+    by `archive_path` in the transcripts bucket. `user_id=None` exports every user.
+    """
+    q = db.query(S).filter(S.started_at.isnot(None))
+    if user_id is not None: q = q.filter(S.user_id == user_id)
+    if since is not None: q = q.filter(S.started_at >= since)
+    if until is not None: q = q.filter(S.started_at < until)
+    if cursor:
+        q = q.filter(tuple_(S.started_at, S.id) > tuple_(*decode_cursor(cursor)))
+    q = q.order_by(S.started_at, S.id).yield_per(batch_size)
+
+    batch = []
+    for s in q:
+        batch.append(s)
+        if len(batch) >= batch_size:
+            yield from _flush(db, batch)
+            batch = []
+    if batch:
+        yield from _flush(db, batch)
+
+def ndjson(records: Iterable[dict], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode records as NDJSON, yielding roughly `chunk_bytes`-sized chunks."""
+    buf, size = [], 0
+    for rec in records:
+        line = (json.dumps(rec, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        buf.append(line); size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf: yield b"".join(buf)
+
+def gzipped(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out: yield out
+    yield z.flush()
+
+def export_stream(user_id: Optional[str] = None, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None, cursor: Optional[str] = None,
+                  gzip: bool = False) -> Iterator[bytes]:
+    """NDJSON byte stream; owns its DB session for the lifetime of the generator."""
+    if cursor: decode_cursor(cursor)  # fail before the first byte is sent
+    def gen():
+        with SessionLocal() as db:
+            yield from ndjson(iter_records(db, user_id, since, until, cursor))
+    return gzipped(gen()) if gzip else gen()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Export sessions, messages and feedback as NDJSON.")
+    p.add_argument("--user", help="Supabase user id; omit to export all users")
+    p.add_argument("--since", type=datetime.fromisoformat, help="ISO timestamp, inclusive")
+    p.add_argument("--until", type=datetime.fromisoformat, help="ISO timestamp, exclusive")
+    p.add_argument("--cursor", help="resume after the last `cursor` record of a previous export")
+    p.add_argument("--gzip", action="store_true", help="gzip-compress the output")
+    p.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = p.parse_args(argv)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_stream(args.user, args.since, args.until, args.cursor, args.gzip):
+            out.write(chunk)
+    finally:
+        if args.output: out.close()
+
+if __name__ == "__main__":
+    main()
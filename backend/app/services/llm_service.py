@@ -1,6 +1,7 @@
 import time
 from typing import Iterable
 from app.core.settings import settings
+from app.core import profiling
 import google.generativeai as genai
 
 class LLMService:
@@ -48,17 +49,20 @@ class LLMService:
             yield self._fallback(user_text); return
         system = self.persona_system(mode, topic, round_no, rounds, turn, turn_s)
         backoff = 0.6
+        t0, first = time.perf_counter(), True  # ttft spans retries and is recorded once
         for _ in range(4):
             try:
                 model = genai.GenerativeModel(self.model_name, system_instruction=system)
-                resp = model.generate_content(
-                    contents=[{"role":"user","parts":[{"text":user_text}]}],
-                    generation_config={"temperature":0.6, "max_output_tokens":256, "top_p":0.9, "top_k":40},
-                    stream=True,
-                )
+                with profiling.span("llm.request"):
+                    resp = model.generate_content(
+                        contents=[{"role":"user","parts":[{"text":user_text}]}],
+                        generation_config={"temperature":0.6, "max_output_tokens":256, "top_p":0.9, "top_k":40},
+                        stream=True,
+                    )
                 for event in resp:
                     try:
                         if hasattr(event, "text") and event.text:
+                            if first: profiling.mark("llm.ttft", time.perf_counter() - t0); first = False
                             yield event.text
                     except Exception:
                         continue
@@ -0,0 +1,100 @@
+import argparse, asyncio, logging
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.db import SessionLocal, engine
+from app.core.partitions import ensure_partitions
+from app.core.settings import settings
+from app.models.models import Session as S, Message
+from app.services.storage import put_json_gz, get_json_gz, archive_path
+
+log = logging.getLogger(__name__)
+ARCHIVE_BUCKET = "transcripts"
+WINDOW_SLACK = timedelta(days=1)
+
+def message_window(s: S) -> list:
+    """Time bounds for `s`'s messages so Postgres can prune monthly partitions."""
+    conds = [Message.session_id == s.id]
+    if s.started_at: conds.append(Message.time >= s.started_at - WINDOW_SLACK)
+    if s.ended_at: conds.append(Message.time <= s.ended_at + WINDOW_SLACK)
+    return conds
+
+def _messages(db, conds: list) -> list:
+    msgs = db.query(Message).filter(*conds).order_by(Message.time).all()
+    return [{"role": m.role, "content": m.content, "time": m.time.isoformat()} for m in msgs]
+
+def session_messages(db, s: S) -> list:
+    """Transcript for `s`, read from the archive blob once the session has been archived."""
+    if s.archived_at and s.archive_path:
+        return get_json_gz(ARCHIVE_BUCKET, s.archive_path)["messages"]
+    return _messages(db, message_window(s))
+
+def archive_session(db, s: S) -> str:
+    """Upload the transcript of `s` as a gzip blob, then drop its message rows.
+
+    Unlike the hot-path reads this is not time-bounded: every row of the
+    session goes into the blob and is deleted, wherever it was filed.
+    """
+    path = archive_path(s.user_id, s.id)
+    put_json_gz(ARCHIVE_BUCKET, path, {"session": s.id, "mode": s.mode, "topic": s.topic,
+                                       "messages": _messages(db, [Message.session_id == s.id])})
+    db.query(Message).filter(Message.session_id==s.id).delete(synchronize_session=False)
+    s.archived_at = datetime.utcnow()
+    s.archive_path = path
+    db.commit()
+    return path
+
+def archive_ended_sessions(db, older_than_days: Optional[int] = None, limit: Optional[int] = None) -> int:
+    """Archive up to `limit` ended sessions whose `ended_at` is older than the cutoff.
+
+    Rows are claimed one at a time with SKIP LOCKED so several workers can run
+    the job concurrently on Postgres.
+    """
+    days = settings.RETENTION_DAYS if older_than_days is None else older_than_days
+    limit = settings.RETENTION_BATCH if limit is None else limit
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    done, failed = 0, set()
+    while done < limit:
+        q = (db.query(S)
+               .filter(S.state == "ended", S.ended_at < cutoff, S.archived_at.is_(None))
+               .order_by(S.ended_at))
+        if failed: q = q.filter(S.id.notin_(failed))
+        s = q.with_for_update(skip_locked=True).first()
+        if not s: break
+        try:
+            archive_session(db, s); done += 1
+        except Exception:
+            db.rollback(); failed.add(s.id)
+            log.exception("archive failed for session %s", s.id)
+    return done
+
+def run_once(older_than_days: Optional[int] = None, limit: Optional[int] = None) -> int:
+    with SessionLocal() as db:
+        n = archive_ended_sessions(db, older_than_days, limit)
+    if n: log.info("archived %d sessions", n)
+    return n
+
+def maintain_partitions() -> list:
+    with engine.begin() as conn:
+        names = ensure_partitions(conn)
+    if names: log.info("created partitions %s", ", ".join(names))
+    return names
+
+async def run_forever(fn, interval_s: int):
+    while True:
+        try:
+            await asyncio.to_thread(fn)
+        except Exception:
+            log.exception("%s failed", fn.__name__)
+        await asyncio.sleep(interval_s)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Archive ended sessions and maintain message partitions.")
+    p.add_argument("--days", type=int, default=None, help=f"archive sessions ended more than N days ago (default {settings.RETENTION_DAYS})")
+    p.add_argument("--limit", type=int, default=None, help=f"max sessions per run (default {settings.RETENTION_BATCH})")
+    args = p.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    maintain_partitions()
+    print(run_once(args.days, args.limit))
+
+if __name__ == "__main__":
+    main()
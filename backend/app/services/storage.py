@@ -1,16 +1,31 @@
 from supabase import create_client, Client
 from app.core.settings import settings
+from app.core import profiling
 from datetime import datetime
-import json
+import gzip, json
 
 def supa_client() -> Client:
     return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
 
 def put_json(bucket: str, path: str, obj: dict, upsert: bool = True):
     client = supa_client()
-    data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
-    return client.storage.from_(bucket).upload(path=path, file=data, file_options={"contentType":"application/json","upsert": upsert})
+    with profiling.span("storage.serialize"):
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    with profiling.span("storage.upload"):
+        return client.storage.from_(bucket).upload(path=path, file=data, file_options={"contentType":"application/json","upsert": upsert})
 
 def transcript_path(user_id: str, session_id: str) -> str:
     dt = datetime.utcnow().strftime("%Y%m%d")
     return f"{user_id or 'anon'}/{dt}/{session_id}.json"
+
+def put_json_gz(bucket: str, path: str, obj: dict, upsert: bool = True):
+    client = supa_client()
+    data = gzip.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return client.storage.from_(bucket).upload(path=path, file=data, file_options={"contentType":"application/gzip","upsert": upsert})
+
+def get_json_gz(bucket: str, path: str) -> dict:
+    client = supa_client()
+    return json.loads(gzip.decompress(client.storage.from_(bucket).download(path)).decode("utf-8"))
+
+def archive_path(user_id: str, session_id: str) -> str:
+    return f"archive/{user_id or 'anon'}/{session_id}.json.gz"
@@ -0,0 +1,150 @@
+"""Hot-path query timings against a large, locally simulated `messages` table.
+
+    # Postgres (run `alembic upgrade head` first so messages/feedback are partitioned)
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_messages --rows 50000000
+
+    # quick local run on SQLite; --drop-index reproduces the pre-retention baseline
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.bench_messages --rows 1000000
+
+Rows are generated server-side (generate_series / recursive CTE) in chunks, so
+seeding 50M rows needs disk, not client memory. Seeding is skipped when the
+table already holds at least --rows rows.
+"""
+import argparse, random, statistics, time
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.core.db import engine, Base
+from app.core.partitions import PARTITIONED, is_partitioned, ensure_partitions
+import app.models.models  # noqa: F401  (register tables)
+
+CHUNK = 1_000_000
+SEED_START, SEED_DAYS = datetime(2024, 1, 1), 700  # must match SEED_SQL
+
+SEED_SQL = {
+    "postgresql": {
+        "sessions": """
+            INSERT INTO sessions (id, user_id, mode, config, state, round_no, turn, started_at, ended_at)
+            SELECT 's' || i, 'u' || (i % 1000), 'debate', '{}', 'ended', 2, 'user',
+                   timestamp '2024-01-01' + (i % 700) * interval '1 day',
+                   timestamp '2024-01-01' + (i % 700) * interval '1 day' + interval '20 minutes'
+            FROM generate_series(:lo, :hi - 1) AS i""",
+        "messages": """
+            INSERT INTO messages (session_id, role, content, time)
+            SELECT 's' || (i % :ns), CASE WHEN i % 2 = 0 THEN 'user' ELSE 'ai' END,
+                   'simulated turn ' || i,
+                   timestamp '2024-01-01' + ((i % :ns) % 700) * interval '1 day' + (i / :ns) * interval '1 second'
+            FROM generate_series(:lo, :hi - 1) AS i""",
+        "feedback": """
+            INSERT INTO feedback (session_id, clarity, structure, persuasiveness, fluency, time_score, overall, tips, created_at)
+            SELECT 's' || i, 70, 70, 70, 70, 70, 70, '[]',
+                   timestamp '2024-01-01' + (i % 700) * interval '1 day' + interval '21 minutes'
+            FROM generate_series(:lo, :hi - 1) AS i""",
+    },
+    "sqlite": {
+        "sessions": """
+            WITH RECURSIVE g(i) AS (SELECT :lo UNION ALL SELECT i + 1 FROM g WHERE i + 1 < :hi)
+            INSERT INTO sessions (id, user_id, mode, config, state, round_no, turn, started_at, ended_at)
+            SELECT 's' || i, 'u' || (i % 1000), 'debate', '{}', 'ended', 2, 'user',
+                   datetime('2024-01-01', '+' || (i % 700) || ' days'),
+                   datetime('2024-01-01', '+' || (i % 700) || ' days', '+20 minutes')
+            FROM g""",
+        "messages": """
+            WITH RECURSIVE g(i) AS (SELECT :lo UNION ALL SELECT i + 1 FROM g WHERE i + 1 < :hi)
+            INSERT INTO messages (session_id, role, content, time)
+            SELECT 's' || (i % :ns), CASE WHEN i % 2 = 0 THEN 'user' ELSE 'ai' END,
+                   'simulated turn ' || i,
+                   datetime('2024-01-01', '+' || ((i % :ns) % 700) || ' days', '+' || (i / :ns) || ' seconds')
+            FROM g""",
+        "feedback": """
+            WITH RECURSIVE g(i) AS (SELECT :lo UNION ALL SELECT i + 1 FROM g WHERE i + 1 < :hi)
+            INSERT INTO feedback (session_id, clarity, structure, persuasiveness, fluency, time_score, overall, tips, created_at)
+            SELECT 's' || i, 70, 70, 70, 70, 70, 70, '[]',
+                   datetime('2024-01-01', '+' || (i % 700) || ' days', '+21 minutes')
+            FROM g""",
+    },
+}
+
+# The per-session reads done by history.get_session, feedback.compute_feedback
+# and the retention job's candidate scan.
+QUERIES = {
+    # bounded by the session's own window, as retention.message_window does
+    "history.messages": ("SELECT role, content, time FROM messages WHERE session_id = :sid "
+                         "AND time >= :lo AND time <= :hi ORDER BY time"),
+    "history.feedback": "SELECT * FROM feedback WHERE session_id = :sid AND created_at >= :lo LIMIT 1",
+    "retention.candidate": ("SELECT id FROM sessions WHERE state = 'ended' AND ended_at < :cutoff "
+                            "AND archived_at IS NULL ORDER BY ended_at LIMIT 1"),
+}
+
+def _seed(conn, table: str, total: int, ns: int):
+    have = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+    if have >= total: return
+    sql = text(SEED_SQL[engine.dialect.name][table])
+    for lo in range(have, total, CHUNK):
+        hi = min(total, lo + CHUNK)
+        t0 = time.perf_counter()
+        conn.execute(sql, {"lo": lo, "hi": hi, "ns": ns}); conn.commit()
+        print(f"  seeded {table} {hi:,}/{total:,} ({time.perf_counter() - t0:.1f}s)")
+
+def _partition_seed_range(conn) -> dict:
+    """Create monthly partitions covering the seeded dates so rows avoid DEFAULT.
+
+    Returns the number of partitions per partitioned table (empty off Postgres).
+    """
+    ensure_partitions(conn, months_ahead=0, today=SEED_START + timedelta(days=SEED_DAYS + 1), since=SEED_START)
+    conn.commit()
+    counts = {}
+    for table in PARTITIONED:
+        if not is_partitioned(conn, table): continue
+        counts[table] = conn.execute(text(
+            "SELECT count(*) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhparent WHERE c.relname = :t"
+        ), {"t": table}).scalar()
+    return counts
+
+def _time(conn, sql: str, params, n: int):
+    q, out = text(sql), []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        conn.execute(q, params()).fetchall()
+        out.append((time.perf_counter() - t0) * 1000)
+    out.sort()
+    return statistics.median(out), out[int(len(out) * .95) - 1], out[-1]
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rows", type=int, default=50_000_000, help="messages rows to simulate")
+    p.add_argument("--turns", type=int, default=20, help="messages per session")
+    p.add_argument("--queries", type=int, default=200, help="samples per query")
+    p.add_argument("--drop-index", action="store_true", help="drop idx_messages_session_time first (baseline)")
+    args = p.parse_args(argv)
+
+    ns = max(1, args.rows // args.turns)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        print(f"{engine.dialect.name}: {args.rows:,} messages / {ns:,} sessions")
+        parts = _partition_seed_range(conn)
+        print("partitions: " + (", ".join(f"{t}={n}" for t, n in parts.items()) or "none (unpartitioned tables)"))
+        _seed(conn, "sessions", ns, ns)
+        _seed(conn, "messages", args.rows, ns)
+        _seed(conn, "feedback", ns, ns)
+        if args.drop_index:
+            conn.execute(text("DROP INDEX IF EXISTS idx_messages_session_time")); conn.commit()
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ANALYZE")); conn.commit()
+
+        fmt = "%Y-%m-%d %H:%M:%S"
+        def window():
+            i = random.randrange(ns)
+            start = SEED_START + timedelta(days=i % SEED_DAYS)
+            return {"sid": f"s{i}", "lo": (start - timedelta(days=1)).strftime(fmt),
+                    "hi": (start + timedelta(minutes=20, days=1)).strftime(fmt)}
+        params = {
+            "history.messages": window,
+            "history.feedback": lambda: {k: v for k, v in window().items() if k != "hi"},
+            "retention.candidate": lambda: {"cutoff": "2025-01-01"},
+        }
+        for name, sql in QUERIES.items():
+            p50, p95, worst = _time(conn, sql, params[name], args.queries)
+            print(f"{name:22s} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms   max {worst:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Overhead of the profiling hooks with sampling off (and, for reference, on).
+
+    python -m benchmarks.bench_profiling --n 200000
+
+Prints nanoseconds per call for a bare no-op, the same inside `span()`, a
+`trace()` block, and one ASGI request through `ProfilingMiddleware`. Exits
+non-zero if any sampling-off hook adds more than --max-overhead-ns over its
+bare baseline.
+"""
+import argparse, asyncio, sys, time
+from app.core import profiling
+from app.core.settings import settings
+
+def _per_call_ns(fn, n: int) -> float:
+    t0 = time.perf_counter_ns()
+    for _ in range(n): fn()
+    return (time.perf_counter_ns() - t0) / n
+
+def _noop(): pass
+
+def _in_span():
+    with profiling.span("bench"): pass
+
+def _in_trace():
+    with profiling.trace("bench"): pass
+
+async def _app(scope, receive, send): pass
+
+def _asgi_ns(app, n: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench"}
+    async def run():
+        t0 = time.perf_counter_ns()
+        for _ in range(n): await app(scope, None, None)
+        return (time.perf_counter_ns() - t0) / n
+    return asyncio.run(run())
+
+def _span_in_trace_ns(n: int) -> float:
+    with profiling.trace("bench"):
+        return _per_call_ns(_in_span, n)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=200_000)
+    p.add_argument("--max-overhead-ns", type=float, default=2000.0,
+                   help="fail if a sampling-off hook costs more than this over its baseline")
+    args = p.parse_args(argv)
+    settings.PROFILE_SLOW_MS = 10**9  # never keep dumps
+
+    settings.PROFILE_SAMPLE_RATE = 0.0
+    base = _per_call_ns(_noop, args.n)
+    asgi = _asgi_ns(_app, args.n)
+    off = [
+        ("span(), sampling off", _per_call_ns(_in_span, args.n), base),
+        ("trace(), sampling off", _per_call_ns(_in_trace, args.n), base),
+        ("ASGI app + middleware, off", _asgi_ns(profiling.ProfilingMiddleware(_app), args.n), asgi),
+    ]
+    rows = [("no-op call", base), ("ASGI app, bare", asgi)] + [(name, ns) for name, ns, _ in off]
+    settings.PROFILE_SAMPLE_RATE = 1.0
+    n_on = max(1, args.n // 100)
+    rows += [
+        ("span(), inside a trace", _span_in_trace_ns(args.n)),
+        ("trace(), sampled (thread start/stop)", _per_call_ns(_in_trace, n_on)),
+    ]
+    for name, ns in rows:
+        print(f"{name:38s} {ns:10.1f} ns/call")
+
+    failed = [(name, ns - ref) for name, ns, ref in off if ns - ref > args.max_overhead_ns]
+    for name, extra in failed:
+        print(f"FAIL {name}: +{extra:.1f} ns over baseline (limit {args.max_overhead_ns:.0f} ns)")
+    if failed: sys.exit(1)
+    print(f"OK: sampling-off overhead within {args.max_overhead_ns:.0f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""initial schema
+
+Revision ID: 0001_initial
+Revises: 
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_initial'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sessions',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('user_id', sa.String()),
+        sa.Column('mode', sa.String()),
+        sa.Column('topic', sa.String(), nullable=True),
+        sa.Column('config', sa.JSON()),
+        sa.Column('state', sa.String()),
+        sa.Column('round_no', sa.Integer()),
+        sa.Column('turn', sa.String()),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_sessions_user_id', 'sessions', ['user_id'])
+    op.create_index('idx_sessions_user_started', 'sessions', ['user_id', 'started_at'])
+    op.create_table(
+        'messages',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('session_id', sa.String(), sa.ForeignKey('sessions.id', ondelete='CASCADE')),
+        sa.Column('role', sa.String()),
+        sa.Column('content', sa.Text()),
+        sa.Column('time', sa.DateTime()),
+    )
+    op.create_table(
+        'feedback',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('session_id', sa.String(), sa.ForeignKey('sessions.id', ondelete='CASCADE')),
+        sa.Column('clarity', sa.Integer()),
+        sa.Column('structure', sa.Integer()),
+        sa.Column('persuasiveness', sa.Integer()),
+        sa.Column('fluency', sa.Integer()),
+        sa.Column('time_score', sa.Integer()),
+        sa.Column('overall', sa.Integer()),
+        sa.Column('tips', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_feedback_session_id', 'feedback', ['session_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('feedback')
+    op.drop_table('messages')
+    op.drop_table('sessions')
@@ -0,0 +1,128 @@
+"""message retention: archive columns, hot-path indexes, monthly partitions
+
+Revision ID: 0002_message_retention
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:01
+
+On Postgres, `messages` and `feedback` are rebuilt as tables range-partitioned
+by month (plus a DEFAULT partition); rows are copied across and the id
+sequences are re-owned. The primary key becomes (id, <partition column>) as
+Postgres requires. Other dialects only get the columns and indexes.
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_message_retention'
+down_revision: Union[str, Sequence[str], None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+# Frozen copies of the app.core.partitions naming/layout as of this revision.
+PARTITIONED = {'messages': 'time', 'feedback': 'created_at'}
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _month_starts(first, last):
+    m, end = date(first.year, first.month, 1), date(last.year, last.month, 1)
+    while m <= end:
+        yield m
+        m = _next_month(m)
+
+
+def _create_partition_sql(table: str, m: date, parent: str) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {table}_y{m.year:04d}m{m.month:02d} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{m.isoformat()}') TO ('{_next_month(m).isoformat()}')")
+
+COLUMNS = {
+    'messages': """
+        id integer NOT NULL DEFAULT nextval('messages_id_seq'),
+        session_id varchar REFERENCES sessions(id) ON DELETE CASCADE,
+        role varchar,
+        content text,
+        time timestamp NOT NULL DEFAULT (now() at time zone 'utc')""",
+    'feedback': """
+        id integer NOT NULL DEFAULT nextval('feedback_id_seq'),
+        session_id varchar REFERENCES sessions(id) ON DELETE CASCADE,
+        clarity integer, structure integer, persuasiveness integer, fluency integer,
+        time_score integer, overall integer, tips text,
+        created_at timestamp NOT NULL DEFAULT (now() at time zone 'utc')""",
+}
+COLUMN_NAMES = {
+    'messages': ['id', 'session_id', 'role', 'content', 'time'],
+    'feedback': ['id', 'session_id', 'clarity', 'structure', 'persuasiveness', 'fluency',
+                 'time_score', 'overall', 'tips', 'created_at'],
+}
+INDEXES = {
+    'messages': ('idx_messages_session_time', 'session_id, time'),
+    'feedback': ('ix_feedback_session_id', 'session_id'),
+}
+
+
+def _partition(table: str, col: str) -> None:
+    bind = op.get_bind()
+    new = f'{table}_partitioned'
+    op.execute(f'CREATE TABLE {new} ({COLUMNS[table]}, PRIMARY KEY (id, {col})) PARTITION BY RANGE ({col})')
+
+    first = bind.execute(sa.text(f'SELECT min({col}) FROM {table}')).scalar() or datetime.utcnow()
+    last = date.today().replace(day=1)
+    for _ in range(MONTHS_AHEAD): last = _next_month(last)
+    for m in _month_starts(first, last):
+        op.execute(_create_partition_sql(table, m, parent=new))
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {new} DEFAULT')
+
+    cols = COLUMN_NAMES[table]
+    select = ', '.join(f"COALESCE({c}, now() at time zone 'utc')" if c == col else c for c in cols)
+    op.execute(f'INSERT INTO {new} ({", ".join(cols)}) SELECT {select} FROM {table}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {new}.id')
+    op.execute(f'DROP TABLE {table}')
+    op.execute(f'ALTER TABLE {new} RENAME TO {table}')
+    name, on = INDEXES[table]
+    op.execute(f'CREATE INDEX {name} ON {table} ({on})')
+
+
+def _unpartition(table: str) -> None:
+    plain = f'{table}_plain'
+    op.execute(f'CREATE TABLE {plain} (LIKE {table} INCLUDING DEFAULTS)')
+    op.execute(f'INSERT INTO {plain} SELECT * FROM {table}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {plain}.id')
+    op.execute(f'DROP TABLE {table} CASCADE')
+    op.execute(f'ALTER TABLE {plain} RENAME TO {table}')
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+    op.execute(f'ALTER TABLE {table} ADD FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('archived_at', sa.DateTime(), nullable=True))
+    op.add_column('sessions', sa.Column('archive_path', sa.String(), nullable=True))
+    op.create_index('idx_sessions_state_ended', 'sessions', ['state', 'ended_at'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_feedback_session_id', table_name='feedback')
+        for table, col in PARTITIONED.items():
+            _partition(table, col)
+    else:
+        op.create_index('idx_messages_session_time', 'messages', ['session_id', 'time'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in PARTITIONED:
+            _unpartition(table)
+        op.create_index('ix_feedback_session_id', 'feedback', ['session_id'])
+    else:
+        op.drop_index('idx_messages_session_time', table_name='messages')
+
+    op.drop_index('idx_sessions_state_ended', table_name='sessions')
+    op.drop_column('sessions', 'archive_path')
+    op.drop_column('sessions', 'archived_at')
@@ -0,0 +1,21 @@
+import os
+import pytest
+
+# Settings() requires these at import time; tests never reach the real services.
+for k in ("SUPABASE_URL", "SUPABASE_ANON_KEY", "SUPABASE_SERVICE_ROLE_KEY", "GEMINI_API_KEY"):
+    os.environ.setdefault(k, "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+@pytest.fixture
+def db():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.core.db import Base
+    import app.models.models  # noqa: F401  (register tables)
+    # one shared connection so threadpool code (StreamingResponse) sees the same tables
+    engine = create_engine("sqlite://", future=True, poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, future=True)() as session:
+        yield session
@@ -0,0 +1,73 @@
+import gzip, json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.models.models import Session as S, Message, Feedback
+from app.routers import export
+from app.routers.deps_supabase import get_current_user
+from app.services import export_service
+from app.services.export_service import iter_records, ndjson, gzipped
+
+@pytest.fixture
+def seeded(db):
+    t0 = datetime(2024, 1, 1)
+    for i in range(5):
+        sid = f"s{i}"
+        db.add(S(id=sid, user_id="u1" if i % 2 == 0 else "u2", mode="debate", topic="t", config={},
+                 started_at=t0 + timedelta(days=i)))
+        db.add(Message(session_id=sid, role="user", content=f"hello {i}", time=t0 + timedelta(days=i)))
+        db.add(Feedback(session_id=sid, overall=70, tips="[]"))
+    db.commit()
+    return db
+
+def test_export_filters_and_resume(seeded):
+    db = seeded
+    recs = list(iter_records(db, user_id="u1", batch_size=2))
+    assert [r["id"] for r in recs if r["type"] == "session"] == ["s0", "s2", "s4"]
+    assert sum(r["type"] == "message" for r in recs) == 3
+
+    cursor = next(r["cursor"] for r in recs if r["type"] == "cursor")
+    rest = list(iter_records(db, user_id="u1", cursor=cursor, batch_size=2))
+    assert [r["id"] for r in rest if r["type"] == "session"] == ["s4"]
+
+    ranged = list(iter_records(db, since=datetime(2024, 1, 2), until=datetime(2024, 1, 4)))
+    assert [r["id"] for r in ranged if r["type"] == "session"] == ["s1", "s2"]
+
+def test_export_gzip_ndjson(seeded):
+    chunks = list(ndjson(iter_records(seeded), chunk_bytes=256))
+    assert len(chunks) > 1 and all(c.endswith(b"\n") for c in chunks)
+    blob = b"".join(gzipped(chunks))
+    lines = gzip.decompress(blob).decode("utf-8").splitlines()
+    assert all(json.loads(l)["type"] in {"session", "message", "feedback", "cursor"} for l in lines)
+
+@pytest.fixture
+def client(seeded, monkeypatch):
+    monkeypatch.setattr(export_service, "SessionLocal", sessionmaker(bind=seeded.get_bind(), future=True))
+    app = FastAPI()
+    app.include_router(export.router)
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "u1", "email": None}
+    return TestClient(app)
+
+def test_export_endpoint_own_sessions(client):
+    r = client.get("/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    recs = [json.loads(l) for l in r.text.splitlines()]
+    assert {r["user_id"] for r in recs if r["type"] == "session"} == {"u1"}
+
+def test_export_endpoint_gzip(client):
+    r = client.get("/export", params={"gzip": True})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(r.content).decode("utf-8").splitlines()
+    assert sum(json.loads(l)["type"] == "session" for l in lines) == 3
+
+def test_export_endpoint_rejects_bad_input(client, monkeypatch):
+    assert client.get("/export", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/export", params={"all_users": True}).status_code == 403
+    monkeypatch.setattr(export, "is_admin", lambda user: True)
+    r = client.get("/export", params={"all_users": True})
+    assert r.status_code == 200
+    assert sum(json.loads(l)["type"] == "session" for l in r.text.splitlines()) == 5
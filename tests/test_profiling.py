@@ -0,0 +1,29 @@
+import time
+
+from app.core import profiling
+from app.core.settings import settings
+
+def test_sampling_off_is_noop(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    with profiling.trace("GET /x") as tr:
+        assert tr is None
+        with profiling.span("db"): pass
+    assert profiling.span("db") is profiling._NOOP
+
+def test_slow_trace_dumped(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_SLOW_MS", 0)
+    monkeypatch.setattr(settings, "PROFILE_INTERVAL_MS", 1)
+    monkeypatch.setattr(settings, "PROFILE_DUMP_DIR", str(tmp_path))
+    with profiling.trace("ws:user_text") as tr:
+        with profiling.span("db"):
+            assert len(tr.active) == 1
+            time.sleep(0.02)
+        assert not tr.active  # outside spans nothing is sampled
+        profiling.mark("llm.ttft", 0.5)
+    tr.sampler.join(1)  # the dump is built on the sampler thread
+    dump = profiling.recent_dumps()[-1]
+    assert dump["id"] == tr.id
+    assert dump["stages_ms"]["llm.ttft"] == 500.0 and dump["stages_ms"]["db"] >= 20
+    assert dump["samples"] > 0 and any("test_profiling.py" in line for line in dump["collapsed"])
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".folded", ".json"]
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, date
+from app.core.partitions import month_starts, create_partition_sql
+from app.models.models import Session as S, Message
+from app.services import retention
+from app.services.export_service import iter_records
+
+def test_month_partitions():
+    assert list(month_starts(datetime(2024, 11, 15), datetime(2025, 2, 1))) == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)]
+    assert create_partition_sql("messages", date(2024, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS messages_y2024m12 PARTITION OF messages "
+        "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')")
+
+def test_archive_and_read_through(monkeypatch, db):
+    blobs = {}
+    monkeypatch.setattr(retention, "put_json_gz", lambda bucket, path, obj: blobs.__setitem__(path, obj))
+    monkeypatch.setattr(retention, "get_json_gz", lambda bucket, path: blobs[path])
+
+    now = datetime.utcnow()
+    db.add(S(id="old", user_id="u1", state="ended", config={},
+             started_at=now - timedelta(days=41), ended_at=now - timedelta(days=40)))
+    db.add(S(id="new", user_id="u1", state="ended", config={},
+             started_at=now - timedelta(days=2), ended_at=now - timedelta(days=1)))
+    db.add(Message(session_id="old", role="user", content="hi old", time=now - timedelta(days=41)))
+    db.add(Message(session_id="new", role="user", content="hi new", time=now - timedelta(days=2)))
+    db.commit()
+
+    assert retention.archive_ended_sessions(db, older_than_days=30, limit=10) == 1
+    old = db.get(S, "old")
+    assert old.archived_at is not None and old.archive_path in blobs
+    assert db.query(Message).filter(Message.session_id == "old").count() == 0
+    assert retention.session_messages(db, old)[0]["content"] == "hi old"
+    assert db.query(Message).filter(Message.session_id == "new").count() == 1
+
+    exported = [r for r in iter_records(db) if r.get("id") == "old" or r.get("session_id") == "old"]
+    assert [r["type"] for r in exported] == ["session"]
+    assert exported[0]["archive_path"] == old.archive_path
+
+def test_archive_moves_every_message(monkeypatch, db):
+    blobs = {}
+    monkeypatch.setattr(retention, "put_json_gz", lambda bucket, path, obj: blobs.__setitem__(path, obj))
+    t0 = datetime(2024, 3, 1)
+    s = S(id="s", user_id="u1", state="ended", config={}, started_at=t0, ended_at=t0 + timedelta(minutes=30))
+    db.add(s)
+    db.add(Message(session_id="s", role="user", content="in", time=t0 + timedelta(minutes=5)))
+    db.add(Message(session_id="s", role="user", content="stray", time=t0 - timedelta(days=30)))
+    db.commit()
+    path = retention.archive_session(db, s)
+    assert [m["content"] for m in blobs[path]["messages"]] == ["stray", "in"]
+    assert db.query(Message).filter(Message.session_id == "s").count() == 0